@@ -2,29 +2,43 @@ import pandas as pd
 from datetime import datetime
 from typing import Dict, Any
 
+from agents.ledger_store import DEFAULT_LEDGER_PATH, load_transactions
+from agents.reconciler import effective_transactions
+from agents.recurring_detector import detect_recurring
+
 class BudgetingAgent:
     """
-    Reads structured_transactions.csv and provides:
+    Reads the transactions ledger (or an interchange CSV) and provides:
       - Total income, expenses, savings
       - Expense breakdown by category
       - Monthly credit/debit/savings summary
       - A simple savings recommendation
+      - Recurring payments / subscriptions with expected next charges
     """
 
-    def __init__(self, csv_path: str):
-        # 1) Load CSV
-        self.df = pd.read_csv(csv_path)
+    COLUMNS = ['Date', 'Amount', 'Type', 'Category', 'IsDuplicate', 'IsTransfer']
+    # Description is the expensive column; only the recurring section reads it
+    RECURRING_COLUMNS = ['Date', 'Description', 'Amount', 'Type',
+                         'IsDuplicate', 'IsTransfer']
+
+    def __init__(self, path: str = DEFAULT_LEDGER_PATH):
+        self.path = path
+        self._recurring_df = None
+
+        # 1) Load only the columns we use; skip duplicate copies and
+        #    transfers between the household's own accounts
+        self.df = effective_transactions(load_transactions(path, columns=self.COLUMNS))
 
         # 2) Ensure 'Date' exists
         if 'Date' not in self.df.columns:
-            raise ValueError("CSV must include a 'Date' column")
+            raise ValueError("Ledger must include a 'Date' column")
 
         # 3) Parse 'Date' into datetime, drop unparseable rows
         self.df['Date'] = pd.to_datetime(self.df['Date'], errors='coerce')
         self.df = self.df.dropna(subset=['Date'])
 
         # 4) Normalize 'Type' and compute 'Month'
-        self.df['Type'] = self.df['Type'].str.capitalize()
+        self.df['Type'] = self.df['Type'].astype(str).str.capitalize()
         # .dt accessor is now safe because 'Date' is datetime
         self.df['Month'] = self.df['Date'].dt.to_period('M')
 
@@ -42,7 +56,7 @@ class BudgetingAgent:
         # Only expenses, grouped by Category
         return (
             self.df[self.df['Type'] == 'Debit']
-            .groupby('Category')['Amount']
+            .groupby('Category', observed=True)['Amount']
             .sum()
             .sort_values(ascending=False)
         )
@@ -87,16 +101,50 @@ class BudgetingAgent:
             'suggestion': suggestion
         }
 
-    def run(self) -> Dict[str, Any]:
+    def _recurring_transactions(self) -> pd.DataFrame:
+        # loaded on first use and cached, so budget-only callers never pay
+        # for decoding narrations
+        if self._recurring_df is None:
+            df = effective_transactions(
+                load_transactions(self.path, columns=self.RECURRING_COLUMNS)
+            )
+            df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+            df = df.dropna(subset=['Date'])
+            df['Type'] = df['Type'].astype(str).str.capitalize()
+            self._recurring_df = df
+        return self._recurring_df
+
+    def recurring_summary(self) -> Dict[str, Any]:
+        rec = detect_recurring(self._recurring_transactions())
+        expense = self.compute_totals()['total_expense']
+        rec['cost_share'] = (rec['total_spent'] / expense * 100) if expense else 0.0
+        # dates as YYYY-MM-DD strings (None once a pattern has stopped)
+        for col in ('last_charge', 'next_expected'):
+            rec[col] = pd.Series([
+                d.strftime('%Y-%m-%d') if pd.notna(d) else None
+                for d in pd.to_datetime(rec[col])
+            ], index=rec.index, dtype=object)
+        recurring_spent = float(rec['total_spent'].sum())
         return {
+            'subscriptions': rec.to_dict(orient='records'),
+            'total_annual_cost': float(rec['annual_cost'].sum()),
+            'recurring_spent': recurring_spent,
+            'recurring_pct': (recurring_spent / expense * 100) if expense else 0.0
+        }
+
+    def run(self, include_recurring: bool = False) -> Dict[str, Any]:
+        result = {
             'totals': self.compute_totals(),
             'category_expenses': self.category_summary().to_dict(),
             'monthly_summary': self.monthly_summary().to_dict(orient='records'),
             'recommendation': self.recommend_savings()
         }
+        if include_recurring:
+            result['recurring'] = self.recurring_summary()
+        return result
 
 if __name__ == '__main__':
     import json
-    agent = BudgetingAgent('data/structured_transactions.csv')
-    result = agent.run()
+    agent = BudgetingAgent(DEFAULT_LEDGER_PATH)
+    result = agent.run(include_recurring=True)
     print(json.dumps(result, indent=2, default=str))
@@ -0,0 +1,344 @@
+# agents/classical_allocator.py
+import numpy as np
+from typing import Dict, Any, Optional
+
+METHODS = ("min_variance", "mean_variance", "risk_parity")
+
+
+class IncrementalCovariance:
+    """
+    Running mean / covariance of N-asset return vectors (Welford updates).
+
+    - add(x) grows the sample, remove(x) drops an old observation, so a
+      rolling window costs O(N^2) per step instead of O(window * N^2).
+    - Use add() alone for an expanding window.
+    """
+
+    def __init__(self, n_assets: int):
+        self.n = 0
+        self.mean = np.zeros(n_assets)
+        self.m2 = np.zeros((n_assets, n_assets))
+
+    def add(self, x: np.ndarray):
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += np.outer(delta, x - self.mean)
+
+    def remove(self, x: np.ndarray):
+        if self.n <= 1:
+            self.n = 0
+            self.mean[:] = 0.0
+            self.m2[:] = 0.0
+            return
+        self.n -= 1
+        delta = x - self.mean
+        self.mean -= delta / self.n
+        self.m2 -= np.outer(delta, x - self.mean)
+
+    def covariance(self) -> np.ndarray:
+        if self.n < 2:
+            return np.zeros_like(self.m2)
+        cov = self.m2 / (self.n - 1)
+        # symmetrize away floating-point drift from the rank-1 updates
+        return 0.5 * (cov + cov.T)
+
+
+def _regularize(cov: np.ndarray, ridge: float) -> np.ndarray:
+    """Adds ridge * mean(diag) to the diagonal of each (.., N, N) matrix."""
+    n = cov.shape[-1]
+    scale = np.trace(cov, axis1=-2, axis2=-1) / n
+    scale = np.where(scale > 0, scale, 1.0)
+    return cov + (ridge * scale)[..., None, None] * np.eye(n)
+
+
+def _project_simplex(v: np.ndarray) -> np.ndarray:
+    """Euclidean projection of each row of v onto {w >= 0, sum(w) = 1}."""
+    n = v.shape[-1]
+    u = -np.sort(-v, axis=-1)
+    css = np.cumsum(u, axis=-1) - 1.0
+    ks = np.arange(1, n + 1)
+    rho = np.sum(u - css / ks > 0, axis=-1, keepdims=True)
+    theta = np.take_along_axis(css, rho - 1, axis=-1) / rho
+    return np.clip(v - theta, 0.0, None)
+
+
+def _solve_on_support(
+    mu: np.ndarray,
+    cov: np.ndarray,
+    risk_aversion: float,
+    support: np.ndarray
+) -> np.ndarray:
+    """
+    Exact minimizer of (risk_aversion / 2) w'Σw - w'mu with sum(w) = 1 and
+    w = 0 off `support`, from the batched KKT system
+    [λΣ_SS 1; 1' 0] [w_S; ν] = [mu_S; 1]. Off-support rows are replaced by
+    the identity so the whole stack solves in one call.
+    """
+    K, n = mu.shape
+    s = support.astype(float)
+    kkt = np.zeros((K, n + 1, n + 1))
+    kkt[:, :n, :n] = risk_aversion * cov * s[:, :, None] * s[:, None, :]
+    kkt[:, np.arange(n), np.arange(n)] += 1.0 - s
+    kkt[:, :n, n] = s
+    kkt[:, n, :n] = s
+    rhs = np.concatenate([mu * s, np.ones((K, 1))], axis=1)
+    return np.linalg.solve(kkt, rhs[..., None])[:, :n, 0] * s
+
+
+def _simplex_qp(
+    mu: np.ndarray,
+    cov: np.ndarray,
+    risk_aversion: float,
+    iters: int = 5000,
+    tol: float = 1e-10,
+    polish_every: int = 20
+) -> np.ndarray:
+    """
+    Solves min (risk_aversion / 2) w'Σw - w'mu over the long-only simplex
+    for a (K, N, N) stack at once, by accelerated projected gradient with
+    adaptive restart (step 1 / largest eigenvalue of λΣ).
+
+    Every polish_every iterations the current support is solved exactly
+    (_solve_on_support); rows whose polished weights satisfy the KKT
+    conditions are final. The gradient steps only have to find the set of
+    held assets, not converge to it. Rows that never qualify stop once their
+    weights move by less than tol.
+    """
+    K, n = mu.shape
+    step = 1.0 / (risk_aversion * np.linalg.eigvalsh(cov)[:, -1])
+    w = np.full((K, n), 1.0 / n)
+    y, t = w.copy(), np.ones(K)
+    active = np.ones(K, dtype=bool)
+    for it in range(1, iters + 1):
+        a = np.flatnonzero(active)
+        if a.size == 0:
+            break
+        grad = risk_aversion * np.einsum("kij,kj->ki", cov[a], y[a]) - mu[a]
+        w_new = _project_simplex(y[a] - step[a, None] * grad)
+        move = w_new - w[a]
+        t_new = 0.5 * (1.0 + np.sqrt(1.0 + 4.0 * t[a] ** 2))
+        # restart momentum when it points uphill
+        restart = np.einsum("ki,ki->k", y[a] - w_new, move) > 0
+        t_new[restart] = 1.0
+        y[a] = w_new + (((t[a] - 1.0) / t_new) * ~restart)[:, None] * move
+        w[a], t[a] = w_new, t_new
+        active[a] = np.max(np.abs(move), axis=-1) > tol
+
+        if it % polish_every == 0:
+            a = np.flatnonzero(active)
+            support = w[a] > 0
+            exact = _solve_on_support(mu[a], cov[a], risk_aversion, support)
+            g = risk_aversion * np.einsum("kij,kj->ki", cov[a], exact) - mu[a]
+            # KKT: g equal (= -ν) on the support and no smaller off it
+            nu = np.where(support, g, 0.0).sum(axis=1) / support.sum(axis=1)
+            slack = 1e-9 * np.abs(g).max(axis=1)
+            ok = (
+                np.all(exact >= 0, axis=1)
+                & np.all(support | (g >= nu[:, None] - slack[:, None]), axis=1)
+            )
+            w[a[ok]] = exact[ok]
+            active[a[ok]] = False
+    return w
+
+
+def min_variance_weights(cov: np.ndarray, ridge: float = 1e-6) -> np.ndarray:
+    """
+    Long-only minimum-variance weights: min w'Σw s.t. sum(w) = 1, w >= 0.
+    cov: (N, N) or a stack (K, N, N); returns (N,) or (K, N).
+    """
+    cov = _regularize(np.asarray(cov, dtype=float), ridge)
+    single = cov.ndim == 2
+    if single:
+        cov = cov[None]
+    w = _simplex_qp(np.zeros(cov.shape[:-1]), cov, 1.0)
+    return w[0] if single else w
+
+
+def mean_variance_weights(
+    mu: np.ndarray,
+    cov: np.ndarray,
+    risk_aversion: float = 1.0,
+    ridge: float = 1e-6
+) -> np.ndarray:
+    """
+    Long-only mean-variance weights under a full-investment budget:
+    max w'mu - (risk_aversion / 2) w'Σw s.t. sum(w) = 1, w >= 0.
+    Scaling mu and Σ together (daily -> annual) leaves the optimum
+    unchanged, so risk_aversion does not depend on the return frequency.
+    mu: (N,) or (K, N); cov: (N, N) or (K, N, N).
+    """
+    cov = _regularize(np.asarray(cov, dtype=float), ridge)
+    mu = np.asarray(mu, dtype=float)
+    single = cov.ndim == 2
+    if single:
+        cov, mu = cov[None], mu[None]
+    w = _simplex_qp(mu, cov, risk_aversion)
+    return w[0] if single else w
+
+
+def risk_parity_weights(
+    cov: np.ndarray,
+    sweeps: int = 100,
+    tol: float = 1e-10
+) -> np.ndarray:
+    """
+    Equal-risk-contribution weights by cyclical coordinate descent on
+    y'Σy / 2 - sum(log y) / N, run on the whole (K, N, N) stack at once.
+    Each coordinate has a closed-form positive root, so weights stay long-only.
+    """
+    cov = np.asarray(cov, dtype=float)
+    single = cov.ndim == 2
+    if single:
+        cov = cov[None]
+    n = cov.shape[-1]
+    diag = np.clip(np.diagonal(cov, axis1=-2, axis2=-1), 1e-18, None)
+    y = 1.0 / np.sqrt(diag)
+    b = 1.0 / n
+    for _ in range(sweeps):
+        prev = y.copy()
+        for i in range(n):
+            # Σ_ij y_j over j != i
+            cross = np.einsum("kj,kj->k", cov[:, i, :], y) - diag[:, i] * y[:, i]
+            y[:, i] = (-cross + np.sqrt(cross ** 2 + 4.0 * diag[:, i] * b)) / (2.0 * diag[:, i])
+        if np.max(np.abs(y - prev) / prev) < tol:
+            break
+    w = y / y.sum(axis=-1, keepdims=True)
+    return w[0] if single else w
+
+
+def solve_weights(
+    method: str,
+    mu: np.ndarray,
+    cov: np.ndarray,
+    risk_aversion: float = 1.0
+) -> np.ndarray:
+    if method == "min_variance":
+        return min_variance_weights(cov)
+    if method == "mean_variance":
+        return mean_variance_weights(mu, cov, risk_aversion)
+    if method == "risk_parity":
+        return risk_parity_weights(cov)
+    raise ValueError(f"Unknown allocation method: {method}")
+
+
+def iter_moments(
+    returns: np.ndarray,
+    dates_idx: np.ndarray,
+    window: Optional[int] = 252,
+    chunk: int = 64
+):
+    """
+    Mean and covariance of the returns observed before each t in dates_idx
+    (sorted), maintained incrementally. window=None gives an expanding
+    window. Yields (mus (k, N), covs (k, N, N)) for at most `chunk` dates at
+    a time, so memory stays O(chunk * N^2) however many dates there are.
+    """
+    T, N = returns.shape
+    stats = IncrementalCovariance(N)
+    t = 0
+    for lo in range(0, len(dates_idx), chunk):
+        block = dates_idx[lo:lo + chunk]
+        mus = np.zeros((len(block), N))
+        covs = np.zeros((len(block), N, N))
+        for k, stop in enumerate(block):
+            while t < stop:
+                stats.add(returns[t])
+                if window is not None and t - window >= 0:
+                    stats.remove(returns[t - window])
+                t += 1
+            mus[k] = stats.mean
+            covs[k] = stats.covariance()
+        yield mus, covs
+
+
+def rolling_moments(
+    returns: np.ndarray,
+    dates_idx: np.ndarray,
+    window: Optional[int] = 252
+):
+    """
+    All of iter_moments at once: (mus (K, N), covs (K, N, N)).
+    Needs K * N^2 floats; prefer iter_moments for many dates.
+    """
+    chunks = list(iter_moments(returns, dates_idx, window))
+    if not chunks:
+        N = returns.shape[1]
+        return np.zeros((0, N)), np.zeros((0, N, N))
+    return (
+        np.concatenate([c[0] for c in chunks]),
+        np.concatenate([c[1] for c in chunks]),
+    )
+
+
+def _simulate(
+    returns: np.ndarray,
+    rebal_idx: np.ndarray,
+    rebal_w: np.ndarray,
+    turnover_cost: float
+) -> Dict[str, Any]:
+    """
+    Holds equal weights until the first rebalance, then each solved weight
+    vector until the next one; charges turnover_cost on every rebalance.
+    """
+    T, N = returns.shape
+    held = np.empty((T, N))
+    held[:rebal_idx[0]] = 1.0 / N
+    seg = np.searchsorted(rebal_idx, np.arange(rebal_idx[0], T), side="right") - 1
+    held[rebal_idx[0]:] = rebal_w[seg]
+
+    port_ret = np.einsum("tn,tn->t", held, returns)
+    prev = np.vstack([np.full((1, N), 1.0 / N), rebal_w[:-1]])
+    turnover = np.abs(rebal_w - prev).sum(axis=1)
+    costs = np.zeros(T)
+    costs[rebal_idx] = turnover * turnover_cost
+    value = np.cumprod(1.0 + port_ret - costs)
+
+    return {
+        "weights": rebal_w[-1].tolist(),
+        "value": float(value[-1]),
+        "turnover": float(turnover.sum()),
+        "rebalance_index": rebal_idx.tolist(),
+    }
+
+
+def run_baselines(
+    prices: np.ndarray,
+    window: Optional[int] = 252,
+    rebalance_every: int = 21,
+    risk_aversion: float = 1.0,
+    turnover_cost: float = 0.001,
+    methods: tuple = METHODS,
+    chunk: int = 64
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Walk-forward backtest of every classical method on a (T, N) price matrix.
+
+    - Weights at each rebalance date use only returns observed before it.
+    - Moments are computed once, incrementally, and shared by all methods;
+      each method solves up to `chunk` rebalance dates per batched call,
+      which bounds memory when rebalancing daily over long histories.
+    - value is net of turnover cost; rebalance_index is the price row at
+      whose close the weights are set (they earn from the next row on).
+    """
+    returns = prices[1:] / prices[:-1] - 1.0              # (T-1, N)
+    T, N = returns.shape
+    warmup = min(max(2, window or 2), T)
+    rebal_idx = np.arange(warmup, T, rebalance_every)
+    if len(rebal_idx) == 0:
+        flat = {
+            "weights": (np.ones(N) / N).tolist(),
+            "value": 1.0,
+            "turnover": 0.0,
+            "rebalance_index": [],
+        }
+        return {m: dict(flat) for m in methods}
+
+    weights = {m: [] for m in methods}
+    for mus, covs in iter_moments(returns, rebal_idx, window, chunk):
+        for m in methods:
+            weights[m].append(solve_weights(m, mus, covs, risk_aversion))
+    return {
+        m: _simulate(returns, rebal_idx, np.concatenate(weights[m]), turnover_cost)
+        for m in methods
+    }
@@ -1,8 +1,16 @@
 import pdfplumber
 import pandas as pd
-from datetime import datetime
 import re
 
+from agents.ledger_store import (
+    DEFAULT_CSV_PATH,
+    DEFAULT_LEDGER_PATH,
+    ledger_to_csv,
+    write_ledger,
+)
+from agents.statement_parser import TableParser
+from agents.reconciler import reconcile
+
 # Keyword-based categorization rules
 CATEGORY_RULES = {
     "swiggy": "Food",
@@ -31,99 +39,41 @@ CATEGORY_RULES = {
     "salary": "Income",
 }
 
-def categorize(description: str) -> str:
-    desc = description.lower()
+def categorize_series(descriptions: pd.Series) -> pd.Series:
+    """
+    Keyword categorization: one regex pass per keyword over the whole
+    column, first matching rule wins.
+    """
+    desc = descriptions.fillna("").astype(str).str.lower()
+    categories = pd.Series("Other", index=desc.index, dtype=object)
+    unassigned = pd.Series(True, index=desc.index)
     for keyword, category in CATEGORY_RULES.items():
-        if re.search(r'\b' + re.escape(keyword) + r'\b', desc):
-            return category
-    return "Other"
+        hit = unassigned & desc.str.contains(r'\b' + re.escape(keyword) + r'\b', regex=True)
+        categories[hit] = category
+        unassigned &= ~hit
+    return categories
+
+def categorize(description: str) -> str:
+    """Single-narration form of categorize_series."""
+    return categorize_series(pd.Series([description])).iloc[0]
 
 def extract_transactions_from_pdf(pdf_path: str) -> pd.DataFrame:
-    rows = []
+    # one parser per document: header schemas and date formats are cached
+    parser = TableParser()
+    tables = []
 
     with pdfplumber.open(pdf_path) as pdf:
         for page in pdf.pages:
-            for table in page.extract_tables():
-                # normalize header
-                header = [cell.strip().lower() if cell else "" for cell in table[0]]
-
-                # Case A: Bank‐style with separate Debit & Credit columns
-                if "debit" in header and "credit" in header and "narration" in header:
-                    idx_date   = header.index("trn. date")
-                    idx_narr   = header.index("narration")
-                    idx_debit  = header.index("debit")
-                    idx_credit = header.index("credit")
-
-                    for row in table[1:]:
-                        raw_date = row[idx_date].strip()
-                        try:
-                            date = datetime.strptime(raw_date, "%d-%m-%Y")
-                        except:
-                            continue
-
-                        narr  = (row[idx_narr] or "").strip()
-                        debit = (row[idx_debit] or "").replace(",", "").strip()
-                        credit= (row[idx_credit] or "").replace(",", "").strip()
+            tables.extend(page.extract_tables())
 
-                        if debit and debit not in ("0",""):
-                            amt   = float(debit)
-                            ttype = "Debit"
-                        elif credit and credit not in ("0",""):
-                            amt   = float(credit)
-                            ttype = "Credit"
-                        else:
-                            continue
-
-                        rows.append({
-                            "Date": date,
-                            "Description": narr,
-                            "Amount": amt,
-                            "Type": ttype,
-                            "Category": categorize(narr)
-                        })
-
-                # Case B: Paytm‐style single “Amount” column with +/- sign
-                elif "amount" in header and ("transaction details" in header or "narration" in header):
-                    idx_date    = header.index(next(h for h in header if "date" in h))
-                    idx_narr    = header.index("transaction details") if "transaction details" in header else header.index("narration")
-                    idx_amount  = header.index("amount")
-
-                    for row in table[1:]:
-                        raw_date = row[idx_date].strip()
-                        # Try multiple date formats
-                        for fmt in ("%d %b'%y %I:%M %p", "%d-%m-%Y", "%d %b %Y"):
-                            try:
-                                date = datetime.strptime(raw_date, fmt)
-                                break
-                            except:
-                                continue
-                        else:
-                            continue
-
-                        narr = (row[idx_narr] or "").strip()
-                        raw_amt = (row[idx_amount] or "").replace(",", "").strip()
-                        # Expect something like "+ Rs.183" or "- Rs.1,608"
-                        m = re.search(r"([+-])\s*Rs\.?\s*([\d\.]+)", raw_amt)
-                        if not m:
-                            continue
-                        sign, num = m.groups()
-                        amt = float(num)
-                        ttype = "Credit" if sign=="+" else "Debit"
-
-                        rows.append({
-                            "Date": date,
-                            "Description": narr,
-                            "Amount": amt,
-                            "Type": ttype,
-                            "Category": categorize(narr)
-                        })
+    df = parser.parse_tables(tables)
 
     # Always return a DataFrame with the right columns
-    if not rows:
+    if df.empty:
         return pd.DataFrame(columns=["Date","Description","Amount","Type","Category"])
 
-    df = pd.DataFrame(rows)
-    df.sort_values("Date", inplace=True)
+    df["Category"] = categorize_series(df["Description"])
+    df.sort_values("Date", inplace=True, kind="stable")
     return df
 
 def run_extraction():
@@ -132,10 +82,17 @@ def run_extraction():
 
     df_bank = extract_transactions_from_pdf(bank_pdf)
     df_upi  = extract_transactions_from_pdf(upi_pdf)
-
-    combined = pd.concat([df_bank, df_upi], ignore_index=True)
-    combined.to_csv("data/structured_transactions.csv", index=False)
-    print(f"✅ Extracted {len(combined)} transactions to data/structured_transactions.csv")
+    df_bank["Source"] = "bank"
+    df_upi["Source"]  = "paytm_upi"
+
+    # UPI payments also appear as bank debits: flag them, don't drop them
+    combined = reconcile(pd.concat([df_bank, df_upi], ignore_index=True))
+    write_ledger(combined, DEFAULT_LEDGER_PATH)
+    # CSV is kept only as an interchange copy of the ledger
+    ledger_to_csv(DEFAULT_LEDGER_PATH, DEFAULT_CSV_PATH)
+    print(f"✅ Extracted {len(combined)} transactions to {DEFAULT_LEDGER_PATH} "
+          f"({int(combined['IsDuplicate'].sum())} duplicates, "
+          f"{int(combined['IsTransfer'].sum())} transfer legs flagged)")
 
 if __name__ == "__main__":
     run_extraction()
@@ -0,0 +1,235 @@
+# agents/ledger_store.py
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+LEDGER_COLUMNS = [
+    "Date", "Description", "Amount", "Type", "Category",
+    "Source", "MatchId", "IsDuplicate", "IsTransfer",
+]
+# Columns added after the first ledger version; filled with these defaults
+# when a frame or an older ledger/CSV does not carry them
+OPTIONAL_DEFAULTS = {
+    "Source": "",
+    "MatchId": -1,
+    "IsDuplicate": False,
+    "IsTransfer": False,
+}
+DEFAULT_LEDGER_PATH = "data/ledger"
+DEFAULT_CSV_PATH = "data/structured_transactions.csv"
+
+# Low-cardinality string columns stored as integer codes + a dictionary
+_DICT_COLUMNS = ("Type", "Category", "Source")
+_NUMERIC_COLUMNS = {
+    "Amount": "float64",
+    "MatchId": "int64",
+    "IsDuplicate": "bool",
+    "IsTransfer": "bool",
+}
+_META_FILE = "meta.json"
+_FORMAT_VERSION = 3
+# Descriptions are stored as one UTF-8 text joined by this control char, so
+# reading is a single decode + str.split instead of a slice per row
+_DESC_SEP = "\x1f"
+# Interchange CSV dates: day-first with time of day; day-first dates and
+# ISO 8601 are still accepted on import
+CSV_DATE_FORMAT = "%d-%m-%Y %H:%M:%S"
+
+
+def _empty_frame(columns: Sequence[str]) -> pd.DataFrame:
+    dtypes = {"Date": "datetime64[ns]", **_NUMERIC_COLUMNS}
+    return pd.DataFrame({
+        col: pd.Series(dtype=dtypes.get(col, object)) for col in columns
+    })
+
+
+def _with_defaults(df: pd.DataFrame, columns: Sequence[str]) -> pd.DataFrame:
+    """Adds any requested optional column the frame lacks."""
+    for col in columns:
+        if col not in df.columns and col in OPTIONAL_DEFAULTS:
+            df[col] = OPTIONAL_DEFAULTS[col]
+    return df
+
+
+def write_ledger(df: pd.DataFrame, path: str = DEFAULT_LEDGER_PATH) -> None:
+    """
+    Writes a transactions DataFrame as a columnar ledger directory:
+      - Date.npy: int64 nanoseconds since epoch
+      - Amount.npy: float64; MatchId.npy: int64; IsDuplicate/IsTransfer.npy: bool
+      - Type / Category / Source.npy: int32 codes, dictionaries in meta.json
+      - Description.txt: UTF-8 narrations joined by a unit separator (\\x1f),
+        so multi-line narrations need no quoting
+    """
+    missing = [
+        c for c in LEDGER_COLUMNS
+        if c not in df.columns and c not in OPTIONAL_DEFAULTS
+    ]
+    if missing:
+        raise ValueError(f"Ledger is missing columns: {missing}")
+
+    df = _with_defaults(df.copy(), LEDGER_COLUMNS)
+    out = Path(path)
+    out.mkdir(parents=True, exist_ok=True)
+
+    dates = pd.to_datetime(df["Date"]).astype("datetime64[ns]")
+    if dates.isna().any():
+        raise ValueError("Ledger 'Date' column contains unparseable values")
+    np.save(out / "Date.npy", dates.to_numpy().view("int64"))
+    for col, dtype in _NUMERIC_COLUMNS.items():
+        np.save(out / f"{col}.npy", df[col].to_numpy(dtype=dtype))
+
+    dictionaries: Dict[str, List[str]] = {}
+    for col in _DICT_COLUMNS:
+        codes, uniques = pd.factorize(df[col].fillna("").astype(str))
+        np.save(out / f"{col}.npy", codes.astype("int32"))
+        dictionaries[col] = [str(u) for u in uniques]
+
+    texts = (
+        df["Description"].fillna("").astype(str)
+        .str.replace(_DESC_SEP, " ", regex=False)
+    )
+    (out / "Description.txt").write_text(_DESC_SEP.join(texts), encoding="utf-8")
+    legacy = out / "Description.offsets.npy"
+    if legacy.exists():
+        legacy.unlink()
+
+    meta = {
+        "version": _FORMAT_VERSION,
+        "rows": int(len(df)),
+        "columns": LEDGER_COLUMNS,
+        "dictionaries": dictionaries,
+    }
+    (out / _META_FILE).write_text(json.dumps(meta, indent=2), encoding="utf-8")
+
+
+def read_ledger(
+    path: str = DEFAULT_LEDGER_PATH,
+    columns: Optional[Sequence[str]] = None
+) -> pd.DataFrame:
+    """
+    Loads a columnar ledger written by write_ledger.
+    Only the requested columns are touched on disk; numeric columns are
+    memory-mapped and dictionary columns come back as pandas Categoricals.
+    """
+    src = Path(path)
+    meta = json.loads((src / _META_FILE).read_text(encoding="utf-8"))
+    wanted = list(columns) if columns is not None else list(LEDGER_COLUMNS)
+    unknown = [c for c in wanted if c not in LEDGER_COLUMNS]
+    if unknown:
+        raise KeyError(f"Unknown ledger columns: {unknown}")
+    if meta["rows"] == 0:
+        return _empty_frame(wanted)
+
+    data = {}
+    for col in wanted:
+        if col not in meta["columns"]:
+            # written before this column existed; keep the dtype a newer
+            # ledger would give so frames compare equal either way
+            default = np.full(meta["rows"], OPTIONAL_DEFAULTS[col])
+            data[col] = (
+                pd.Categorical(default) if col in _DICT_COLUMNS else default
+            )
+        elif col == "Date":
+            raw = np.load(src / "Date.npy", mmap_mode="r")
+            data[col] = np.asarray(raw).view("datetime64[ns]")
+        elif col in _NUMERIC_COLUMNS:
+            data[col] = np.load(src / f"{col}.npy", mmap_mode="r")
+        elif col in _DICT_COLUMNS:
+            codes = np.load(src / f"{col}.npy", mmap_mode="r")
+            data[col] = pd.Categorical.from_codes(
+                np.asarray(codes), categories=meta["dictionaries"][col]
+            )
+        elif col == "Description":
+            text = (src / "Description.txt").read_text(encoding="utf-8")
+            if meta["version"] < 3:
+                # older layout: concatenated text + character offsets
+                offsets = np.load(src / "Description.offsets.npy").tolist()
+                parts = [text[a:b] for a, b in zip(offsets[:-1], offsets[1:])]
+            else:
+                parts = text.split(_DESC_SEP)
+            data[col] = np.array(parts, dtype=object)
+    return pd.DataFrame(data, columns=wanted)
+
+
+def _parse_csv_dates(raw: pd.Series) -> pd.Series:
+    """
+    Day-first timestamps as written by ledger_to_csv, bare day-first dates,
+    or ISO 8601 as older pandas-default exports wrote them. Raises when a
+    non-empty column yields no date at all, rather than dropping every row.
+    """
+    dates = pd.to_datetime(raw, format=CSV_DATE_FORMAT, errors="coerce")
+    for fmt in ("%d-%m-%Y", "ISO8601"):
+        todo = dates.isna()
+        if not todo.any():
+            break
+        dates[todo] = pd.to_datetime(raw[todo], format=fmt, errors="coerce")
+    if len(raw) and dates.isna().all():
+        raise ValueError(
+            f"No parseable dates in CSV 'Date' column (e.g. {raw.iloc[0]!r})"
+        )
+    return dates
+
+
+def csv_to_ledger(
+    csv_path: str = DEFAULT_CSV_PATH,
+    ledger_path: str = DEFAULT_LEDGER_PATH
+) -> int:
+    """
+    Imports an interchange CSV (day-first dates, quoted multi-line
+    descriptions) into the columnar ledger. Returns the row count written.
+    """
+    df = pd.read_csv(csv_path)
+    df["Date"] = _parse_csv_dates(df["Date"])
+    df = df.dropna(subset=["Date"])
+    write_ledger(df, ledger_path)
+    return len(df)
+
+
+def ledger_to_csv(
+    ledger_path: str = DEFAULT_LEDGER_PATH,
+    csv_path: str = DEFAULT_CSV_PATH
+) -> int:
+    """
+    Exports the columnar ledger to CSV for interchange. Returns the row count.
+    """
+    df = read_ledger(ledger_path)
+    df.to_csv(csv_path, index=False, date_format=CSV_DATE_FORMAT)
+    return len(df)
+
+
+def load_transactions(
+    path: str,
+    columns: Optional[Sequence[str]] = None
+) -> pd.DataFrame:
+    """
+    Agent entry point: reads a ledger directory, or falls back to an
+    interchange CSV when given a .csv path.
+    """
+    if str(path).lower().endswith(".csv"):
+        wanted = list(columns) if columns is not None else LEDGER_COLUMNS
+        required = [c for c in wanted if c not in OPTIONAL_DEFAULTS]
+        df = pd.read_csv(path, usecols=lambda c: c in wanted)
+        missing = [c for c in required if c not in df.columns]
+        if missing:
+            raise ValueError(f"CSV is missing columns: {missing}")
+        if "Date" in df.columns:
+            df["Date"] = _parse_csv_dates(df["Date"])
+        return _with_defaults(df, wanted)[wanted]
+    return read_ledger(path, columns)
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) == 4 and sys.argv[1] == "import":
+        n = csv_to_ledger(sys.argv[2], sys.argv[3])
+        print(f"✅ Imported {n} transactions into {sys.argv[3]}")
+    elif len(sys.argv) == 4 and sys.argv[1] == "export":
+        n = ledger_to_csv(sys.argv[2], sys.argv[3])
+        print(f"✅ Exported {n} transactions to {sys.argv[3]}")
+    else:
+        print("Usage: python -m agents.ledger_store import <csv> <ledger_dir>")
+        print("       python -m agents.ledger_store export <ledger_dir> <csv>")
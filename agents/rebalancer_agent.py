@@ -2,6 +2,7 @@
 import numpy as np
 from envs.data_loader import fetch_price_data
 from envs.portfolio_env import PortfolioEnv
+from agents.classical_allocator import run_baselines
 
 class QLearningRebalancer:
     """
@@ -85,7 +86,9 @@ def build_and_train(
     tickers: list[str],
     start: str = "2020-01-01",
     end: str = None,
-    episodes: int = 500
+    episodes: int = 500,
+    window: int | None = 252,
+    rebalance_every: int = 21
 ):
     prices, dates = fetch_price_data(tickers, start, end)
     agent = QLearningRebalancer(prices)
@@ -95,6 +98,12 @@ def build_and_train(
     static_weights = np.ones(len(tickers)) / len(tickers)
     rec_perf = agent.evaluate(rec_weights)
     stat_perf = agent.evaluate(static_weights)
+    # classical walk-forward baselines to judge the RL recommendation
+    baselines = run_baselines(prices, window, rebalance_every)
+    date_strs = dates.astype(str)
+    for res in baselines.values():
+        res["performance"] = agent.evaluate(np.array(res["weights"]))
+        res["rebalance_dates"] = date_strs[res.pop("rebalance_index")].tolist()
     return {
         "dates": dates.astype(str).tolist(),
         "tickers": tickers,
@@ -103,5 +112,6 @@ def build_and_train(
         "performance": {
             "recommended": rec_perf,
             "static": stat_perf
-        }
+        },
+        "baselines": baselines
     }
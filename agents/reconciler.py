@@ -0,0 +1,185 @@
+# agents/reconciler.py
+import numpy as np
+import pandas as pd
+
+from agents.recurring_detector import normalize_merchant
+
+# UPI RRN / bank reference numbers are 12+ digits
+_REF = r"\d{12,}"
+
+
+def _neighbour_pairs(keys: pd.DataFrame, window_days: int, max_candidates: int) -> pd.DataFrame:
+    """
+    Pairs (i, j), i < j, of rows with the same key, from different sources
+    and at most window_days apart.
+
+    Rows are sorted by (key, day) with same-day rows interleaved across
+    sources, and each row is compared only with the next max_candidates
+    rows. A bucket of m rows therefore yields at most m * max_candidates
+    pairs, keeping time and memory linear however large the bucket is.
+    """
+    keys = keys.assign(turn=keys.groupby(["key", "day", "src"]).cumcount())
+    keys = keys.sort_values(["key", "day", "turn", "src"], kind="stable")
+    row, key, day, src, turn = (
+        keys[c].to_numpy() for c in ("row", "key", "day", "src", "turn")
+    )
+
+    found = []
+    for k in range(1, max_candidates + 1):
+        if k >= len(row):
+            break
+        gap = day[k:] - day[:-k]
+        ok = (key[k:] == key[:-k]) & (gap <= window_days) & (src[k:] != src[:-k])
+        a, b = row[:-k][ok], row[k:][ok]
+        found.append(pd.DataFrame({
+            "i": np.minimum(a, b),
+            "j": np.maximum(a, b),
+            "gap": gap[ok],
+            "skew": np.abs(turn[k:] - turn[:-k])[ok],
+        }))
+    if not found:
+        return pd.DataFrame({"i": [], "j": [], "gap": [], "skew": []}, dtype="int64")
+    return pd.concat(found, ignore_index=True).drop_duplicates(["i", "j"])
+
+
+def find_candidates(
+    df: pd.DataFrame,
+    window_days: int = 2,
+    max_candidates: int = 4
+) -> pd.DataFrame:
+    """
+    Candidate pairs (i, j), i < j, of rows from different sources with the
+    same amount and dates at most window_days apart, that also share
+    - a 12+ digit reference (UPI RRN): ref=True, or failing that
+    - the normalized merchant key of their narrations: ref=False.
+
+    Both joins are sorted-neighbour scans (see _neighbour_pairs), so the
+    candidate set is O(n * max_candidates) rather than all pairs inside a
+    (amount, day) bucket.
+    """
+    base = pd.DataFrame({
+        "row": np.arange(len(df)),
+        "cents": np.round(df["Amount"].to_numpy(dtype=float) * 100).astype("int64"),
+        "day": pd.to_datetime(df["Date"]).to_numpy().astype("datetime64[D]").astype("int64"),
+        "src": pd.factorize(df["Source"].astype(str))[0],
+    })
+    desc = df["Description"].fillna("").astype(str).reset_index(drop=True)
+
+    refs = desc.str.findall(_REF).explode().dropna()
+    by_ref = base.iloc[refs.index].assign(ref=refs.to_numpy())
+    by_ref = by_ref.drop_duplicates(["row", "ref"])
+    by_ref["key"] = by_ref.groupby(["ref", "cents"], sort=False).ngroup()
+    ref_pairs = _neighbour_pairs(by_ref, window_days, max_candidates).assign(ref=True)
+
+    by_name = base.assign(merchant=normalize_merchant(desc).to_numpy())
+    by_name = by_name[by_name["merchant"] != ""]
+    by_name["key"] = by_name.groupby(["merchant", "cents"], sort=False).ngroup()
+    name_pairs = _neighbour_pairs(by_name, window_days, max_candidates).assign(ref=False)
+    # rows that both carry references, but different ones, are different payments
+    has_ref = np.zeros(len(df), dtype=bool)
+    has_ref[by_ref["row"].to_numpy()] = True
+    name_pairs = name_pairs[
+        ~(has_ref[name_pairs["i"].to_numpy()] & has_ref[name_pairs["j"].to_numpy()])
+    ]
+
+    return (
+        pd.concat([ref_pairs, name_pairs], ignore_index=True)
+        .drop_duplicates(["i", "j"])
+        .reset_index(drop=True)
+    )
+
+
+def _match(cand: pd.DataFrame) -> pd.DataFrame:
+    """
+    One-to-one matching over ranked candidate pairs.
+
+    Each round accepts every pair that is the top-ranked remaining pair for
+    both of its rows, then drops candidates touching matched rows. The
+    globally best pair is always accepted, so rounds strictly shrink the
+    candidate set (in practice a handful of rounds).
+    """
+    accepted = []
+    while not cand.empty:
+        ranked = cand.reset_index(drop=True)
+        ends = pd.DataFrame({
+            "node": np.concatenate([ranked["i"], ranked["j"]]),
+            "pair": np.concatenate([ranked.index, ranked.index]),
+        }).sort_values("pair", kind="stable")
+        top = ends.drop_duplicates("node")
+        votes = top.groupby("pair").size()
+        winners = ranked.loc[votes.index[votes.to_numpy() == 2]]
+        accepted.append(winners)
+        used = np.concatenate([winners["i"], winners["j"]])
+        cand = ranked[~(ranked["i"].isin(used) | ranked["j"].isin(used))]
+    if not accepted:
+        return pd.DataFrame(columns=["i", "j", "gap", "skew", "ref"])
+    return pd.concat(accepted, ignore_index=True)
+
+
+def reconcile(
+    df: pd.DataFrame,
+    window_days: int = 2,
+    max_candidates: int = 4
+) -> pd.DataFrame:
+    """
+    Flags cross-source duplicates and self-transfers without dropping rows.
+
+    - Candidates share amount, lie within window_days, come from different
+      Source values and share either a 12+ digit reference (UPI RRN) or a
+      normalized merchant key; see find_candidates.
+    - Opposite-Type (transfer) pairs without a shared reference must also
+      fall on the same day.
+    - Candidates are ranked by shared reference, date gap, then position
+      within same-day runs, and matched one-to-one.
+    - Same Type in both rows -> the later row (by position) gets
+      IsDuplicate; opposite Types -> both legs get IsTransfer.
+    - Both rows of a match share a MatchId; unmatched rows keep -1.
+    """
+    out = df.reset_index(drop=True).copy()
+    out["MatchId"] = -1
+    out["IsDuplicate"] = False
+    out["IsTransfer"] = False
+    if "Source" not in out.columns or out["Source"].nunique() < 2:
+        return out
+
+    cand = find_candidates(out, window_days, max_candidates)
+    if cand.empty:
+        return out
+
+    types = out["Type"].astype(str).to_numpy()
+    opposite = types[cand["i"].to_numpy()] != types[cand["j"].to_numpy()]
+    evidence = cand["ref"].to_numpy() | ~opposite | (cand["gap"].to_numpy() == 0)
+    cand = cand[evidence]
+    if cand.empty:
+        return out
+    cand = cand.sort_values(
+        ["ref", "gap", "skew", "i", "j"],
+        ascending=[False, True, True, True, True],
+    )
+
+    matches = _match(cand)
+    i = matches["i"].to_numpy(dtype="int64")
+    j = matches["j"].to_numpy(dtype="int64")
+    ids = np.arange(len(matches))
+    match_col = out["MatchId"].to_numpy().copy()
+    match_col[i] = ids
+    match_col[j] = ids
+    out["MatchId"] = match_col
+
+    same = types[i] == types[j]
+    dup = out["IsDuplicate"].to_numpy().copy()
+    dup[j[same]] = True
+    out["IsDuplicate"] = dup
+    transfer = out["IsTransfer"].to_numpy().copy()
+    transfer[i[~same]] = True
+    transfer[j[~same]] = True
+    out["IsTransfer"] = transfer
+    return out
+
+
+def effective_transactions(df: pd.DataFrame) -> pd.DataFrame:
+    """Rows that count toward income/expense: no duplicate copies, no self-transfers."""
+    if "IsDuplicate" not in df.columns or "IsTransfer" not in df.columns:
+        return df
+    keep = ~(df["IsDuplicate"].astype(bool) | df["IsTransfer"].astype(bool))
+    return df[keep.to_numpy()].copy()
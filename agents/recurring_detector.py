@@ -0,0 +1,148 @@
+# agents/recurring_detector.py
+import numpy as np
+import pandas as pd
+
+# label -> (nominal interval in days, tolerance in days, calendar step, charges per year)
+PERIODS = {
+    "weekly": (7, 2, pd.DateOffset(weeks=1), 52),
+    "monthly": (30, 4, pd.DateOffset(months=1), 12),
+    "annual": (365, 20, pd.DateOffset(years=1), 1),
+}
+
+# narration noise: rail prefixes, payment-app words, connectors
+_PREFIX = (
+    r"^(?:upi|neft|imps|rtgs|ach|nach|pos)\s+\S*\d\S*\s+(?:debit|credit|dr|cr)\s+"
+    r"|^(?:automatic payment|auto ?pay|payment|paid|money sent|sent|received|pay)"
+    r"\s+(?:to|from)\s+"
+)
+# In bank UPI narrations everything from the payee's IFSC code on
+# (YESB0PTMUPI, UTIB0000553, ...) is VPA handles and app remarks
+_IFSC_TAIL = r"(?s)\b[a-z]{4}0[a-z0-9]{6}\b.*$"
+_STOPWORDS = (
+    r"\b(?:upi|paytm|debit|credit|ref|no|via|mandateexecute|mandate|autopay"
+    r"|bank|axisbank|okaxis|okhdfcbank|oksbi|okicici|okbizaxis|okpayaxis"
+    r"|ybl|ibl|axl|axb|sib|pty|ptys|ptybl|sox|ymp|gpay|googlepay|yespay"
+    r"|yesbank|yesbankltd|hdfcbank|icici|fbpe|bharatpe|eazypay|vyapar|payu"
+    r"|payment|payments|paying|pay|pvt|ltd)\b"
+)
+
+
+def normalize_merchant(descriptions: pd.Series) -> pd.Series:
+    """
+    Vectorized merchant key from a raw narration, e.g.
+    "UPI 500246842139 DEBIT Vikram\\nPetroleum YESB0PTMUPI paytmqr4v paytm UPI"
+    -> "vikram petroleum". The IFSC tail, tokens containing digits (refs,
+    VPAs) and payment-rail words are dropped; the first three words remain.
+    Each distinct narration is cleaned once and mapped back by code.
+    """
+    codes, uniques = pd.factorize(descriptions.fillna("").astype(str))
+    s = pd.Series(uniques, dtype=object).str.lower().str.strip()
+    s = s.str.replace(_PREFIX, "", regex=True)
+    s = s.str.replace(_IFSC_TAIL, "", regex=True)
+    s = s.str.replace(r"[a-z]*\d\S*|[^a-z\s]", " ", regex=True)
+    s = s.str.replace(_STOPWORDS, " ", regex=True)
+    keys = s.str.split().str[:3].str.join(" ").fillna("").to_numpy(dtype=object)
+    return pd.Series(keys[codes], index=descriptions.index)
+
+
+def detect_recurring(
+    df: pd.DataFrame,
+    amount_tol: float = 0.2,
+    min_consistency: float = 0.75,
+    min_occurrences: int = 3
+) -> pd.DataFrame:
+    """
+    Recurring debits grouped by normalized merchant.
+
+    One sort by (merchant, date) plus grouped aggregates over the interval
+    column, so the cost is O(n log n) with no per-merchant Python loop.
+    A merchant is recurring when its median charge interval fits a period
+    in PERIODS and at least min_consistency of both its intervals (within
+    the period tolerance) and its amounts (within amount_tol of the median)
+    agree. Annual patterns need only two charges.
+
+    A pattern is active while last_charge + period + tolerance has not
+    passed the ledger's last date; stopped ones keep active=False, no
+    next_expected and no annual_cost.
+    """
+    cols = ["merchant", "frequency", "occurrences", "typical_amount",
+            "total_spent", "last_charge", "next_expected", "active", "annual_cost"]
+    as_of = pd.to_datetime(df["Date"]).max()
+    debits = df[df["Type"].astype(str) == "Debit"]
+    if debits.empty:
+        return pd.DataFrame(columns=cols)
+
+    tx = pd.DataFrame({
+        "merchant": normalize_merchant(debits["Description"]).to_numpy(),
+        "date": pd.to_datetime(debits["Date"]).dt.normalize().to_numpy(),
+        "amount": debits["Amount"].to_numpy(dtype=float),
+    })
+    tx = tx[tx["merchant"] != ""].sort_values(["merchant", "date"], kind="stable")
+    if tx.empty:
+        return pd.DataFrame(columns=cols)
+
+    # interval to the previous charge of the same merchant (NaN on the first)
+    same = tx["merchant"].eq(tx["merchant"].shift())
+    tx["interval"] = tx["date"].diff().dt.days.where(same)
+
+    g = tx.groupby("merchant", sort=False)
+    stats = g.agg(
+        occurrences=("amount", "size"),
+        typical_amount=("amount", "median"),
+        total_spent=("amount", "sum"),
+        last_charge=("date", "max"),
+        median_interval=("interval", "median"),
+    )
+
+    # map each merchant's median interval to the nearest period label
+    labels = np.array(list(PERIODS))
+    nominal = np.array([p[0] for p in PERIODS.values()], dtype=float)
+    tol = np.array([p[1] for p in PERIODS.values()], dtype=float)
+    med = stats["median_interval"].to_numpy()
+    nearest = np.abs(med[:, None] - nominal[None, :]).argmin(axis=1)
+    fits = np.abs(med - nominal[nearest]) <= tol[nearest]
+    stats["frequency"] = np.where(fits, labels[nearest], None)
+
+    # share of intervals on cadence and of amounts within tolerance,
+    # broadcasting each merchant's period/amount back to its rows
+    gid = g.ngroup().to_numpy()
+    period = nearest[gid]
+    typical = stats["typical_amount"].to_numpy()[gid]
+    interval = tx["interval"].to_numpy()
+    on_cadence = np.abs(interval - nominal[period]) <= tol[period]
+    checks = pd.DataFrame({
+        "merchant": tx["merchant"].to_numpy(),
+        "on_cadence": np.where(np.isnan(interval), np.nan, on_cadence),
+        "steady": np.abs(tx["amount"].to_numpy() - typical) <= amount_tol * typical,
+    }).groupby("merchant", sort=False).mean()
+    stats = stats.join(checks)
+
+    need = np.where(stats["frequency"] == "annual", 2, min_occurrences)
+    keep = (
+        stats["frequency"].notna()
+        & (stats["occurrences"] >= need)
+        & (stats["on_cadence"] >= min_consistency)
+        & (stats["steady"] >= min_consistency)
+    )
+    rec = stats[keep].copy()
+    if rec.empty:
+        return pd.DataFrame(columns=cols)
+
+    rec["next_expected"] = rec["last_charge"]
+    rec["annual_cost"] = 0.0
+    rec["active"] = False
+    for label, (_, tol_days, step, per_year) in PERIODS.items():
+        m = rec["frequency"] == label
+        rec.loc[m, "next_expected"] = rec.loc[m, "last_charge"] + step
+        rec.loc[m, "annual_cost"] = rec.loc[m, "typical_amount"] * per_year
+        rec.loc[m, "active"] = (
+            rec.loc[m, "next_expected"] + pd.Timedelta(days=tol_days) >= as_of
+        )
+    rec["next_expected"] = rec["next_expected"].where(rec["active"])
+    rec["annual_cost"] = rec["annual_cost"].where(rec["active"], 0.0)
+
+    return (
+        rec.reset_index()[cols]
+        .sort_values(["active", "annual_cost"], ascending=False)
+        .reset_index(drop=True)
+    )
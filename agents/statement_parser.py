@@ -0,0 +1,202 @@
+# agents/statement_parser.py
+import inspect
+from abc import ABC, abstractmethod
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+
+PARSED_COLUMNS = ["Date", "Description", "Amount", "Type"]
+
+# name -> layout class, in registration order (first match wins)
+LAYOUTS: Dict[str, type] = {}
+
+
+def register_layout(name: str):
+    """Class decorator that makes a bank layout available to TableParser."""
+    def wrap(cls):
+        if inspect.isabstract(cls):
+            missing = ", ".join(sorted(cls.__abstractmethods__))
+            raise TypeError(f"Layout {cls.__name__} does not implement: {missing}")
+        cls.name = name
+        LAYOUTS[name] = cls
+        return cls
+    return wrap
+
+
+def _clean(col: pd.Series) -> pd.Series:
+    """Cell text with None -> "" and surrounding whitespace stripped."""
+    return col.fillna("").astype(str).str.strip()
+
+
+def _to_amount(col: pd.Series) -> pd.Series:
+    """Numbers with thousands separators; "" -> NaN, anything else unparseable raises."""
+    amount = pd.to_numeric(col.str.replace(",", "", regex=False), errors="coerce")
+    bad = amount.isna() & col.notna() & (col != "")
+    if bad.any():
+        raise ValueError(f"Unparseable amount in statement table: {col[bad].iloc[0]!r}")
+    return amount
+
+
+class StatementLayout(ABC):
+    """
+    Base class for a statement table layout.
+
+    - match(header): does this normalized header belong to the layout?
+    - bind(header): column positions the layout needs
+    - parse(body): columnar parse of the date-parsed table body into
+      Date / Description / Amount / Type, dropping unparseable rows
+    """
+    name = "base"
+    date_formats: Tuple[str, ...] = ()
+
+    @staticmethod
+    @abstractmethod
+    def match(header: List[str]) -> bool:
+        ...
+
+    @staticmethod
+    @abstractmethod
+    def bind(header: List[str]) -> Dict[str, int]:
+        ...
+
+    @abstractmethod
+    def parse(self, body: pd.DataFrame) -> pd.DataFrame:
+        ...
+
+
+@register_layout("bank")
+class BankLayout(StatementLayout):
+    """Bank-style tables with separate Debit & Credit columns."""
+    date_formats = ("%d-%m-%Y",)
+
+    @staticmethod
+    def match(header):
+        return "debit" in header and "credit" in header and "narration" in header
+
+    @staticmethod
+    def bind(header):
+        return {
+            "date": header.index("trn. date"),
+            "narr": header.index("narration"),
+            "debit": header.index("debit"),
+            "credit": header.index("credit"),
+        }
+
+    def parse(self, body):
+        # a zero amount ("0", "0.00") means the column is empty for that row
+        debit = _to_amount(body["debit"])
+        credit = _to_amount(body["credit"])
+        is_debit = debit.fillna(0) != 0
+        is_credit = ~is_debit & (credit.fillna(0) != 0)
+        return pd.DataFrame({
+            "Date": body["date"],
+            "Description": body["narr"],
+            "Amount": np.where(is_debit, debit, credit),
+            "Type": np.where(is_debit, "Debit", "Credit"),
+        })[is_debit | is_credit]
+
+
+@register_layout("paytm")
+class PaytmLayout(StatementLayout):
+    """Paytm-style tables with a single signed "+ Rs.183" Amount column."""
+    date_formats = ("%d %b'%y %I:%M %p", "%d-%m-%Y", "%d %b %Y")
+
+    @staticmethod
+    def match(header):
+        return "amount" in header and ("transaction details" in header or "narration" in header)
+
+    @staticmethod
+    def bind(header):
+        narr = "transaction details" if "transaction details" in header else "narration"
+        return {
+            "date": header.index(next(h for h in header if "date" in h)),
+            "narr": header.index(narr),
+            "amount": header.index("amount"),
+        }
+
+    def parse(self, body):
+        # cells without a signed "Rs." amount are skipped
+        parts = body["amount"].str.extract(r"([+-])\s*Rs\.?\s*([\d,\.]+)")
+        amount = _to_amount(parts[1])
+        return pd.DataFrame({
+            "Date": body["date"],
+            "Description": body["narr"],
+            "Amount": amount,
+            "Type": np.where(parts[0] == "+", "Credit", "Debit"),
+        })[amount.notna()]
+
+
+class TableParser:
+    """
+    Per-document table parser.
+
+    The layout binding for each distinct header, and the date format that
+    fits each layout, are detected once and reused for every later table,
+    so pages that share a layout skip detection entirely. Rows are parsed
+    column-wise with pandas instead of one strptime/regex call per row.
+    """
+
+    def __init__(self, layouts: Optional[Dict[str, type]] = None):
+        self.layouts = [cls() for cls in (layouts or LAYOUTS).values()]
+        self._schemas: Dict[tuple, Optional[Tuple[StatementLayout, Dict[str, int]]]] = {}
+        self._date_formats: Dict[str, List[str]] = {}
+
+    def _schema(self, header_row: list):
+        key = tuple(header_row)
+        if key not in self._schemas:
+            header = [cell.strip().lower() if cell else "" for cell in header_row]
+            self._schemas[key] = next(
+                ((lay, lay.bind(header)) for lay in self.layouts if lay.match(header)),
+                None,
+            )
+        return self._schemas[key]
+
+    def _parse_dates(self, layout: StatementLayout, raw: pd.Series) -> pd.Series:
+        """
+        Tries the cached best format first, then the layout's other formats
+        only on rows still unparsed. The format that parsed the most rows is
+        promoted so later tables usually need a single pass.
+        """
+        formats = self._date_formats.setdefault(layout.name, list(layout.date_formats))
+        dates = pd.Series(pd.NaT, index=raw.index, dtype="datetime64[ns]")
+        hits = []
+        for fmt in formats:
+            todo = dates.isna()
+            if not todo.any():
+                break
+            parsed = pd.to_datetime(raw[todo], format=fmt, errors="coerce")
+            dates[todo] = parsed
+            hits.append((int(parsed.notna().sum()), fmt))
+        best = max(hits, default=(0, None))
+        if best[0] and best[1] != formats[0]:
+            formats.remove(best[1])
+            formats.insert(0, best[1])
+        return dates
+
+    def parse_table(self, table: List[list]) -> Optional[pd.DataFrame]:
+        if not table or len(table) < 2:
+            return None
+        schema = self._schema(table[0])
+        if schema is None:
+            return None
+        layout, idx = schema
+
+        width = max(idx.values()) + 1
+        rows = [list(r) + [None] * (width - len(r)) for r in table[1:]]
+        cells = pd.DataFrame(rows)
+        body = pd.DataFrame({key: _clean(cells[pos]) for key, pos in idx.items()})
+
+        # line breaks inside a date cell ("01 Apr'24\n10:15 PM") become spaces
+        raw_dates = body["date"].str.replace(r"\s+", " ", regex=True)
+        body["date"] = self._parse_dates(layout, raw_dates)
+        body = body[body["date"].notna()]
+        if body.empty:
+            return None
+        return layout.parse(body)
+
+    def parse_tables(self, tables: List[List[list]]) -> pd.DataFrame:
+        frames = [f for f in (self.parse_table(t) for t in tables) if f is not None and not f.empty]
+        if not frames:
+            return pd.DataFrame(columns=PARSED_COLUMNS)
+        return pd.concat(frames, ignore_index=True)
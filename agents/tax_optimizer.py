@@ -1,6 +1,9 @@
 import pandas as pd
 from typing import Dict, Any
 
+from agents.ledger_store import DEFAULT_LEDGER_PATH, load_transactions
+from agents.reconciler import effective_transactions
+
 class TaxOptimizerAgent:
     """
     Computes Indian income tax under both:
@@ -8,8 +11,11 @@ class TaxOptimizerAgent:
       - New Regime: no 80C + ₹75k standard deduction + ₹60k rebate if TI ≤ ₹12L
     """
 
-    def __init__(self, csv_path: str):
-        df = pd.read_csv(csv_path, parse_dates=["Date"])
+    def __init__(self, path: str = DEFAULT_LEDGER_PATH):
+        df = effective_transactions(load_transactions(
+            path,
+            columns=["Date", "Amount", "Type", "Category", "IsDuplicate", "IsTransfer"]
+        ))
         self.df = df
         self.gross = float(df.loc[df["Type"] == "Credit", "Amount"].sum())
         # total invested under 80C-eligible categories
@@ -129,7 +135,7 @@ class TaxOptimizerAgent:
 
 if __name__ == "__main__":
     import json
-    ag = TaxOptimizerAgent("data/structured_transactions.csv")
+    ag = TaxOptimizerAgent(DEFAULT_LEDGER_PATH)
     print(json.dumps({
         "old_regime": ag.estimate_old_regime(),
         "new_regime": ag.estimate_new_regime()
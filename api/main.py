@@ -3,6 +3,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from agents.budgeting_agent import BudgetingAgent
 from agents.tax_optimizer import TaxOptimizerAgent
 from agents.rebalancer_agent import build_and_train
+from agents.ledger_store import DEFAULT_LEDGER_PATH
 app = FastAPI(title="AI Finance Planner API")
 
 # Allow your frontend (e.g., http://localhost:3000) to call this API
@@ -14,17 +15,28 @@ app.add_middleware(
 )
 
 @app.get("/budget-summary")
-def budget_summary():
+def budget_summary(
+    recurring: bool = Query(False, description="Include the recurring-payments section"),
+):
     """
     Returns totals, category breakdown, monthly summary,
     and a savings recommendation.
     """
-    agent = BudgetingAgent("data/structured_transactions.csv")
-    return agent.run()
+    agent = BudgetingAgent(DEFAULT_LEDGER_PATH)
+    return agent.run(include_recurring=recurring)
+
+@app.get("/recurring-summary")
+def recurring_summary():
+    """
+    Returns detected subscriptions / recurring payments with their
+    expected next charge and share of total expenses.
+    """
+    agent = BudgetingAgent(DEFAULT_LEDGER_PATH)
+    return agent.recurring_summary()
 
 @app.get("/tax-summary")
 def tax_summary(regime: str = "old"):
-    agent = TaxOptimizerAgent("data/structured_transactions.csv")
+    agent = TaxOptimizerAgent(DEFAULT_LEDGER_PATH)
     return agent.run(regime)
 
 @app.get("/rebalancer-summary")
@@ -33,6 +45,8 @@ def rebalancer_summary(
     start: str = Query("2020-01-01", description="YYYY-MM-DD"),
     end: str | None = Query(None, description="YYYY-MM-DD or nothing"),
     episodes: int = Query(500, ge=1, description="Q-learning episodes"),
+    window: int = Query(252, ge=0, description="Covariance lookback for classical baselines; 0 = expanding"),
+    rebalance_every: int = Query(21, ge=1, description="Baseline rebalance interval (trading days)"),
 ):
     try:
         ticker_list = [t.strip().upper() for t in tickers.split(",") if t.strip()]
@@ -40,7 +54,9 @@ def rebalancer_summary(
             tickers=ticker_list,
             start=start,
             end=end,
-            episodes=episodes
+            episodes=episodes,
+            window=window or None,
+            rebalance_every=rebalance_every
         )
         return summary
     except Exception as e:
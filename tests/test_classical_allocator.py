@@ -0,0 +1,123 @@
+import numpy as np
+import pytest
+
+from agents.classical_allocator import (
+    IncrementalCovariance,
+    _regularize,
+    iter_moments,
+    mean_variance_weights,
+    min_variance_weights,
+    risk_parity_weights,
+    rolling_moments,
+    run_baselines,
+)
+
+
+def _returns(T=400, N=6, seed=0):
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0.0004, 0.01, (T, 1))
+    return market + rng.normal(0.0002, 1.0, (T, N)) * rng.uniform(0.005, 0.02, N)
+
+
+def _prices(T=400, N=6, seed=0):
+    return 100.0 * np.vstack([np.ones(N), np.cumprod(1.0 + _returns(T, N, seed), axis=0)])
+
+
+@pytest.mark.parametrize("window", [60, None])
+def test_incremental_moments_match_numpy(window):
+    r = _returns()
+    dates = np.array([2, 30, 61, 150, 399])
+    mus, covs = rolling_moments(r, dates, window)
+    for t, mu, cov in zip(dates, mus, covs):
+        seen = r[:t] if window is None else r[max(0, t - window):t]
+        np.testing.assert_allclose(mu, seen.mean(axis=0), atol=1e-14)
+        np.testing.assert_allclose(cov, np.cov(seen.T), atol=1e-14)
+
+
+def test_chunked_moments_equal_one_pass():
+    r = _returns()
+    dates = np.arange(60, 400, 7)
+    chunks = list(iter_moments(r, dates, 60, chunk=5))
+    assert max(len(c[0]) for c in chunks) == 5
+    mus, covs = rolling_moments(r, dates, 60)
+    np.testing.assert_allclose(np.concatenate([c[1] for c in chunks]), covs)
+
+
+def test_remove_undoes_add():
+    r = _returns(N=3)
+    stats = IncrementalCovariance(3)
+    for x in r[:50]:
+        stats.add(x)
+    for x in r[:20]:
+        stats.remove(x)
+    np.testing.assert_allclose(stats.covariance(), np.cov(r[20:50].T), atol=1e-14)
+
+
+def test_risk_parity_equalizes_contributions():
+    covs = np.stack([np.cov(_returns(seed=s)[-120:].T) for s in range(3)])
+    w = risk_parity_weights(covs)
+    contrib = w * np.einsum("kij,kj->ki", covs, w)
+    share = contrib / contrib.sum(axis=1, keepdims=True)
+    np.testing.assert_allclose(share, 1.0 / covs.shape[-1], atol=1e-8)
+
+
+def _kkt_gap(w, grad):
+    """Largest KKT violation on the simplex: equal gradient on the support, no lower one off it."""
+    support = w > 1e-8
+    nu = grad[support].mean()
+    return max(np.abs(grad[support] - nu).max(), max(0.0, nu - grad[~support].min(initial=np.inf)))
+
+
+@pytest.mark.parametrize("risk_aversion", [1.0, 10.0, 1000.0])
+def test_mean_variance_is_the_long_only_optimum(risk_aversion):
+    r = _returns(N=8)[-250:]
+    mu, cov = r.mean(axis=0), np.cov(r.T)
+    w = mean_variance_weights(mu, cov, risk_aversion)
+    assert w.min() >= 0 and np.isclose(w.sum(), 1.0)
+    grad = risk_aversion * _regularize(cov, 1e-6) @ w - mu
+    assert _kkt_gap(w, grad) < 1e-6 * np.abs(grad).max()
+
+
+def test_min_variance_matches_closed_form_when_unconstrained():
+    cov = np.diag([1.0, 2.0, 4.0]) * 1e-4
+    inv = 1.0 / np.diag(_regularize(cov, 1e-6))
+    np.testing.assert_allclose(min_variance_weights(cov), inv / inv.sum(), atol=1e-9)
+
+
+def test_min_variance_drops_assets_instead_of_shorting():
+    # the third asset only hedges the first; unconstrained it would be short
+    cov = np.array([[1.0, 0.2, 0.9], [0.2, 1.0, 0.0], [0.9, 0.0, 1.0]]) * 1e-4
+    w = min_variance_weights(cov)
+    assert w.min() >= 0 and np.isclose(w.sum(), 1.0)
+    assert _kkt_gap(w, _regularize(cov, 1e-6) @ w) < 1e-12
+
+
+def test_backtest_has_no_lookahead():
+    prices = _prices()
+    base = run_baselines(prices, window=60, rebalance_every=50)
+    last = base["min_variance"]["rebalance_index"][-1]
+    assert base["min_variance"]["rebalance_index"][0] == 60
+
+    shock = np.linspace(1.0, 3.0, prices.shape[1])
+    # prices after the close of the last decision row cannot move its weights
+    later = prices.copy()
+    later[last + 1:] *= shock
+    moved = run_baselines(later, window=60, rebalance_every=50)
+    for method, result in base.items():
+        assert result["rebalance_index"] == moved[method]["rebalance_index"]
+        np.testing.assert_allclose(result["weights"], moved[method]["weights"])
+    assert base["risk_parity"]["value"] != moved["risk_parity"]["value"]
+
+    # ...but the close of the decision row itself is already known
+    same_day = prices.copy()
+    same_day[last:] *= shock
+    moved = run_baselines(same_day, window=60, rebalance_every=50)
+    assert not np.allclose(base["risk_parity"]["weights"], moved["risk_parity"]["weights"])
+
+
+def test_short_history_falls_back_to_equal_weights():
+    result = run_baselines(_prices(T=30, N=4), window=60)
+    for method in ("min_variance", "mean_variance", "risk_parity"):
+        assert result[method]["rebalance_index"] == []
+        assert result[method]["weights"] == [0.25] * 4
+        assert result[method]["value"] == 1.0
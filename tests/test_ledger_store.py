@@ -0,0 +1,41 @@
+import pandas as pd
+import pytest
+
+from agents.ledger_store import csv_to_ledger, ledger_to_csv, load_transactions, read_ledger
+
+
+def _frame():
+    return pd.DataFrame({
+        "Date": pd.to_datetime(["2025-01-02", "2025-01-13 10:15:00"], format="ISO8601"),
+        "Description": ["UPI 500246842139 DEBIT Vikram\nPetroleum", "Paid to Swiggy"],
+        "Amount": [250.0, 183.5],
+        "Type": ["Debit", "Debit"],
+        "Category": ["Fuel", "Food"],
+    })
+
+
+def test_csv_round_trip_keeps_time_of_day(tmp_path):
+    src = tmp_path / "in.csv"
+    _frame().to_csv(src, index=False, date_format="%d-%m-%Y %H:%M:%S")
+    assert csv_to_ledger(str(src), str(tmp_path / "ledger")) == 2
+    ledger_to_csv(str(tmp_path / "ledger"), str(tmp_path / "out.csv"))
+    back = load_transactions(str(tmp_path / "out.csv"))
+    assert back["Date"].tolist() == _frame()["Date"].tolist()
+    assert back["Description"].tolist() == _frame()["Description"].tolist()
+
+
+def test_iso_dates_from_older_exports_are_imported(tmp_path):
+    src = tmp_path / "iso.csv"
+    _frame().assign(Date=["2025-01-02", "2025-01-13 10:15:00"]).to_csv(src, index=False)
+    assert csv_to_ledger(str(src), str(tmp_path / "ledger")) == 2
+    dates = read_ledger(str(tmp_path / "ledger"), columns=["Date"])["Date"]
+    assert dates.tolist() == _frame()["Date"].tolist()
+
+
+def test_unparseable_dates_raise_instead_of_dropping_rows(tmp_path):
+    src = tmp_path / "bad.csv"
+    _frame().assign(Date=["Jan 2nd", "soon"]).to_csv(src, index=False)
+    with pytest.raises(ValueError):
+        csv_to_ledger(str(src), str(tmp_path / "ledger"))
+    with pytest.raises(ValueError):
+        load_transactions(str(src))
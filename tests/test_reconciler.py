@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+
+from agents.reconciler import effective_transactions, find_candidates, reconcile
+
+
+def _ledger(rows):
+    return pd.DataFrame(
+        rows, columns=["Date", "Description", "Amount", "Type", "Source"]
+    ).assign(Date=lambda d: pd.to_datetime(d["Date"]))
+
+
+def test_upi_payment_seen_in_bank_is_flagged_duplicate():
+    df = _ledger([
+        ("2025-01-02", "UPI 500246842139 DEBIT Vikram\nPetroleum YESB0PTMUPI paytm UPI",
+         250.0, "Debit", "bank"),
+        ("2025-01-03", "Paid to Vikram Petroleum", 250.0, "Debit", "paytm_upi"),
+    ])
+    out = reconcile(df)
+    assert out["IsDuplicate"].tolist() == [False, True]
+    assert not out["IsTransfer"].any()
+    assert out.loc[0, "MatchId"] == out.loc[1, "MatchId"] != -1
+
+
+def test_self_transfer_with_shared_reference_flags_both_legs():
+    df = _ledger([
+        ("2025-01-05", "UPI 501039956410 DEBIT Own savings", 5000.0, "Debit", "bank"),
+        ("2025-01-06", "UPI/501039956410/credit", 5000.0, "Credit", "savings"),
+    ])
+    out = reconcile(df)
+    assert out["IsTransfer"].tolist() == [True, True]
+    assert not out["IsDuplicate"].any()
+
+
+def test_frequent_merchant_duplicates_are_all_flagged():
+    days = pd.date_range("2025-01-01", periods=60, freq="D").astype(str)
+    rows = []
+    for k, day in enumerate(days):
+        rows.append((day, f"UPI 50024684{k:04d} DEBIT Swiggy\nLimited YESB0PTMUPI paytm UPI",
+                     250.0, "Debit", "bank"))
+        rows.append((day, "Paid to Swiggy Limited", 250.0, "Debit", "paytm_upi"))
+    out = reconcile(_ledger(rows))
+    assert out["IsDuplicate"].sum() == 60
+    assert out.loc[out["IsDuplicate"], "Source"].eq("paytm_upi").all()
+
+
+def test_different_references_are_not_duplicates():
+    df = _ledger([
+        ("2025-01-02", "UPI 500246842139 DEBIT Swiggy Limited", 250.0, "Debit", "bank"),
+        ("2025-01-02", "UPI 500246842140 DEBIT Swiggy Limited", 250.0, "Debit", "savings"),
+    ])
+    assert (reconcile(df)["MatchId"] == -1).all()
+
+
+def test_candidates_stay_linear_in_a_crowded_bucket():
+    n = 4000
+    df = _ledger([
+        ("2025-01-02", "Paid to Swiggy Limited", 100.0, "Debit", str(k % 2))
+        for k in range(n)
+    ])
+    cand = find_candidates(df, max_candidates=4)
+    assert len(cand) <= 4 * n
+    assert reconcile(df)["IsDuplicate"].sum() == n // 2
+
+
+def test_unrelated_same_amount_rows_are_not_matched():
+    df = _ledger([
+        ("2025-01-02", "Paid to Vikram Petroleum", 500.0, "Debit", "paytm_upi"),
+        ("2025-01-03", "UPI 501067317306 CREDIT NAMRATA JOSHI okaxis UPI",
+         500.0, "Credit", "bank"),
+        ("2025-01-02", "UPI 500981271816 DEBIT Centria Fuels", 500.0, "Debit", "bank"),
+    ])
+    out = reconcile(df)
+    assert (out["MatchId"] == -1).all()
+    assert len(effective_transactions(out)) == 3
+
+
+def test_unrelated_narrations_rarely_match_at_scale():
+    rng = np.random.default_rng(0)
+    n = 5000
+    first = np.array(["vikram", "centria", "satadhar", "namrata", "mehul", "kartik",
+                      "jinesh", "shlock", "swiggy", "blinkit", "zomato", "amazon"])
+    last = np.array(["petroleum", "fuels", "joshi", "mehta", "parmar", "limited"])
+    names = np.char.add(np.char.add(first[rng.integers(0, len(first), n)], " "),
+                        last[rng.integers(0, len(last), n)])
+    df = _ledger(list(zip(
+        (pd.Timestamp("2024-01-01")
+         + pd.to_timedelta(rng.integers(0, 365, n), unit="D")).astype(str),
+        np.char.add("Paid to ", names),
+        rng.integers(1, 2000, n).astype(float),
+        np.where(rng.random(n) < 0.7, "Debit", "Credit"),
+        rng.integers(0, 10, n).astype(str),
+    )))
+    out = reconcile(df)
+    flagged = (out["IsDuplicate"] | out["IsTransfer"]).mean()
+    assert flagged < 0.01
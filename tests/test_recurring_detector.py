@@ -0,0 +1,64 @@
+from pathlib import Path
+
+import pandas as pd
+
+from agents.ledger_store import load_transactions
+from agents.recurring_detector import detect_recurring, normalize_merchant
+
+CSV_PATH = Path(__file__).resolve().parents[1] / "data" / "structured_transactions.csv"
+
+
+def _keys_for(descriptions: pd.Series, needle: str) -> set:
+    hits = descriptions[descriptions.str.contains(needle, case=False, regex=False)]
+    return set(normalize_merchant(hits))
+
+
+def test_real_narrations_collapse_to_one_merchant_key():
+    desc = load_transactions(str(CSV_PATH), columns=["Description"])["Description"]
+    assert _keys_for(desc, "Vikram") == {"vikram petroleum"}
+    assert _keys_for(desc, "Blinkit") == {"blinkit"}
+    assert _keys_for(desc, "Swiggy") == {"swiggy limited"}
+    assert _keys_for(desc, "SATADHAR") == {"satadhar petroleum"}
+    assert _keys_for(desc, "Centria") == {"centria fuels"}
+    assert _keys_for(desc, "Avadh") == {"avadh enterprise"}
+
+
+def test_app_style_narrations():
+    desc = pd.Series([
+        "Automatic payment to Netflix via UPI",
+        "Paid to Netflix",
+        "UPI 100662564666 DEBIT Netflix UTIB0000553 netflix gpay okpayaxis UPI",
+    ])
+    assert normalize_merchant(desc).tolist() == ["netflix"] * 3
+
+
+def _charges(name, dates, amount):
+    return [(d, f"Paid to {name}", amount, "Debit") for d in dates]
+
+
+def test_detects_cadences_and_flags_stopped_subscriptions():
+    rows = (
+        _charges("Netflix", pd.date_range("2024-01-01", periods=12, freq="MS")
+                 + pd.Timedelta(days=4), 649.0)
+        + _charges("Milk Man", pd.date_range("2024-10-07", periods=12, freq="7D"), 120.0)
+        + _charges("Amazon Prime", pd.to_datetime(["2023-03-01", "2024-03-01"]), 1499.0)
+        + _charges("Spotify", pd.date_range("2021-01-01", periods=6, freq="MS"), 119.0)
+        + _charges("Random Shop", pd.to_datetime(
+            ["2024-01-01", "2024-01-04", "2024-02-20", "2024-06-11"]), 300.0)
+    )
+    df = pd.DataFrame(rows, columns=["Date", "Description", "Amount", "Type"])
+    rec = detect_recurring(df).set_index("merchant")
+
+    assert set(rec.index) == {"netflix", "milk man", "amazon prime", "spotify"}
+    assert rec.loc["netflix", "frequency"] == "monthly"
+    assert rec.loc["milk man", "frequency"] == "weekly"
+    assert rec.loc["amazon prime", "frequency"] == "annual"
+
+    assert rec.loc["netflix", "active"]
+    assert rec.loc["netflix", "next_expected"] == pd.Timestamp("2025-01-05")
+    assert rec.loc["netflix", "annual_cost"] == 649.0 * 12
+
+    spotify = rec.loc["spotify"]
+    assert not spotify["active"]
+    assert pd.isna(spotify["next_expected"])
+    assert spotify["annual_cost"] == 0.0
@@ -0,0 +1,101 @@
+import pandas as pd
+import pytest
+
+from agents.statement_parser import (
+    LAYOUTS,
+    PARSED_COLUMNS,
+    StatementLayout,
+    TableParser,
+    register_layout,
+)
+
+BANK_HEADER = ["Trn. Date", "Narration", "Chq/Ref No", "Debit", "Credit", "Balance"]
+PAYTM_HEADER = ["Date & Time", "Transaction Details", "Your Account", "Amount"]
+
+
+def _frame(rows):
+    df = pd.DataFrame(rows, columns=PARSED_COLUMNS)
+    df["Date"] = pd.to_datetime(df["Date"]).astype("datetime64[ns]")
+    return df
+
+
+def _check(actual, expected_rows):
+    expected = _frame(expected_rows)
+    actual = actual.reset_index(drop=True)
+    actual["Date"] = actual["Date"].astype("datetime64[ns]")
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+
+def test_bank_table():
+    table = [
+        BANK_HEADER,
+        ["02-01-2025", "UPI 500246842139 DEBIT Vikram\nPetroleum", "", "250.00", "", "9,750.00"],
+        ["03-01-2025", "NEFT SALARY", "", "0.00", "1,20,000.00", "1,29,750.00"],
+        ["04-01-2025", "Interest", "", "0", "12.5", "1,29,762.50"],
+        ["05-01-2025", "Zero row", "", "0.00", "0.00", "1,29,762.50"],
+        ["Opening Balance", "", "", "", "", "10,000.00"],
+        [None, "wrapped narration line", None, None, None, None],
+    ]
+    _check(TableParser().parse_tables([table]), [
+        ("2025-01-02", "UPI 500246842139 DEBIT Vikram\nPetroleum", 250.0, "Debit"),
+        ("2025-01-03", "NEFT SALARY", 120000.0, "Credit"),
+        ("2025-01-04", "Interest", 12.5, "Credit"),
+    ])
+
+
+def test_paytm_table():
+    table = [
+        PAYTM_HEADER,
+        ["01 Apr'24\n10:15 PM", "Paid to Swiggy Limited", "HDFC - 12", "- Rs.1,608"],
+        ["02 Apr'24 9:05 AM", "Received from Namrata", "HDFC - 12", "+ Rs.183"],
+        ["03 Apr'24 9:05 AM", "Cashback pending", "HDFC - 12", ""],
+        ["Total", "", "", "- Rs.1,425"],
+    ]
+    _check(TableParser().parse_tables([table]), [
+        ("2024-04-01 22:15", "Paid to Swiggy Limited", 1608.0, "Debit"),
+        ("2024-04-02 09:05", "Received from Namrata", 183.0, "Credit"),
+    ])
+
+
+def test_paytm_date_format_is_detected_once_per_document():
+    parser = TableParser()
+    first = [PAYTM_HEADER, ["05-04-2024", "Paid to Blinkit", "", "- Rs.99"]]
+    later = [PAYTM_HEADER, ["06-04-2024", "Paid to Blinkit", "", "- Rs.120"]]
+    out = parser.parse_tables([first, later])
+    assert out["Amount"].tolist() == [99.0, 120.0]
+    assert parser._date_formats["paytm"][0] == "%d-%m-%Y"
+    assert len(parser._schemas) == 1
+
+
+def test_multi_line_date_cells_parse_like_strptime():
+    # strptime matched a format space against any whitespace run, so these
+    # parsed before as well; a break inside a token still does not
+    table = [
+        PAYTM_HEADER,
+        ["01 Apr\n2024", "Paid to Blinkit", "", "- Rs.99"],
+        ["01 Ap\nr'24 10:15 PM", "Paid to Blinkit", "", "- Rs.99"],
+    ]
+    out = TableParser().parse_tables([table])
+    assert out["Date"].tolist() == [pd.Timestamp("2024-04-01")]
+
+
+@pytest.mark.parametrize("debit", ["1,2a", "-"])
+def test_malformed_bank_amount_raises(debit):
+    table = [BANK_HEADER, ["02-01-2025", "Bad row", "", debit, "", ""]]
+    with pytest.raises(ValueError, match="Unparseable amount"):
+        TableParser().parse_tables([table])
+
+
+def test_unknown_tables_are_skipped():
+    assert TableParser().parse_tables([[["Foo", "Bar"], ["1", "2"]]]).empty
+
+
+def test_incomplete_layout_cannot_register():
+    class Half(StatementLayout):
+        @staticmethod
+        def match(header):
+            return False
+
+    with pytest.raises(TypeError):
+        register_layout("half")(Half)
+    assert "half" not in LAYOUTS